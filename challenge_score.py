@@ -8,11 +8,16 @@
 '''
 
 import argparse
-import textwrap
+import mmap
+import os
 import re
-from collections import deque
+import string
+import textwrap
+import sys
+from collections import Counter
 from datetime import datetime, date
-from enum import Enum, auto
+from functools import lru_cache
+from itertools import chain
 
 # Basic points letters/callsigns/ids (1 point if not in this list)
 # N.B: only one from this list allowed per QSO
@@ -35,6 +40,11 @@ BONUS = {
     'FIRST': 10
 }
 
+# Points and bonus for each of the letters or extras that may
+# follow a LICW number, combined so each needs one lookup
+SCORE_TABLE = {key: (POINTS.get(key, 0), BONUS.get(key, 0))
+               for key in set(POINTS) | set(BONUS)}
+
 VALID_BANDS = [
     '160M',
     '80M',
@@ -67,6 +77,24 @@ SPC_DX = [
     'DX'
 ]
 
+# ADIF fields that must all be present in a QSO record for it to be
+# a possible challenge QSO (the SPC and LICW number are in the comment)
+REQUIRED_FIELDS = frozenset((
+    'BAND',
+    'CALL',
+    'NAME',
+    'QSO_DATE',
+    'MODE',
+    'COMMENT'
+))
+
+# ADIF fields kept from each QSO record, all others are skipped over.
+# TIME_ON is only kept to help identify a bad record in error messages.
+QSO_FIELDS = REQUIRED_FIELDS | {'TIME_ON'}
+
+# Challenge quarter number and 2 or 4 digit year, e.g. 2:23
+_QUARTER_RE = re.compile(r'([1-4]):([0-9]{2}|[0-9]{4})')
+
 # *******************************************************************
 #  Classes
 # *******************************************************************
@@ -98,6 +126,12 @@ class ChallengeException(Exception):
 class Qso():
     ''' Class representing a QSO '''
 
+    # Many QSOs may be created, so use slots rather than a per instance dict.
+    # The SPC, points and bonus are read for every QSO when scoring, so
+    # they are plain attributes rather than properties.
+    __slots__ = ('_date', '_band', '_callsign', '_name', 'spc', '_mode',
+                 '_licw_nr', 'points', '_bonus_letters', 'bonus')
+
     def __init__(self, qso_fields=None):
         ''' Constructor '''
         # These are the minimum fields required for a valid QSO
@@ -106,14 +140,14 @@ class Qso():
         self._band = None
         self._callsign = None
         self._name = None
-        self._spc = None
+        self.spc = None
         self._mode = None
         self._licw_nr = None
         # Base points for QSO
-        self._points = 0
+        self.points = 0
         # Optional bonus points
-        self._bonus_letters = None
-        self._bonus = 0
+        self._bonus_letters = ''
+        self.bonus = 0
         # Parse the optional QSO fields
         if qso_fields:
             self.load_qso(qso_fields)
@@ -126,14 +160,15 @@ class Qso():
     @property
     def mode_is_valid(self):
         """ The mode is CW """
-        return self._mode and self._mode.upper() == 'CW'
+        return self._mode == 'CW'
 
 
     @property
     def is_valid(self):
         ''' Getter to determine if the QSO is valid '''
         # Need all the required fields
-        return self.band_is_valid and self._callsign and self._name and self._spc and self._licw_nr and self._date and self.mode_is_valid
+        return all((self.band_is_valid, self._callsign, self._name, self.spc,
+                    self._licw_nr, self._date, self.mode_is_valid))
 
     @property
     def callsign(self):
@@ -150,11 +185,6 @@ class Qso():
         ''' Getter for date '''
         return self._date
 
-    @property
-    def spc(self):
-        ''' Getter for SPC '''
-        return self._spc
-
     @property
     def mode(self):
         """ Getter for Mode """
@@ -175,20 +205,10 @@ class Qso():
         ''' Getter for bonus letters '''
         return self._bonus_letters
 
-    @property
-    def points(self):
-        ''' Getter for base points '''
-        return self._points
-
-    @property
-    def bonus(self):
-        ''' Getter for bonus points '''
-        return self._bonus
-
     @property
     def total(self):
         ''' Getter for total points '''
-        return self._points + self._bonus
+        return self.points + self.bonus
 
     def load_qso(self, qso_fields):
         ''' Load required QSO data fields from the given
@@ -196,40 +216,53 @@ class Qso():
         '''
         # Invalidate any previous data
         self._licw_nr = None
-        self._bonus_letters = None
+        self._bonus_letters = ''
         self._date = None
         self._mode = None
-        if 'BAND' in qso_fields:
-            self._band = qso_fields['BAND']
-        if 'CALL' in qso_fields:
-            self._callsign = qso_fields['CALL']
-        if 'NAME' in qso_fields:
-            self._name = qso_fields['NAME']
-        if 'QSO_DATE' in qso_fields:
+        # Look each field up once, keeping the current value of
+        # any field not present in this record
+        get = qso_fields.get
+        # Band and SPC take few distinct values, so intern them to
+        # share one string object between all QSOs using them
+        band = get('BAND')
+        if band:
+            self._band = sys.intern(band)
+        self._callsign = get('CALL', self._callsign)
+        self._name = get('NAME', self._name)
+        qso_date = get('QSO_DATE')
+        if qso_date:
             try:
-                self._date = int(qso_fields['QSO_DATE'])
+                self._date = int(qso_date)
             except ValueError:
                 pass
-        if 'MODE' in qso_fields:
-            self._mode = qso_fields['MODE']
+        # Mode is only compared, so store it in uppercase once here
+        mode = get('MODE')
+        self._mode = mode.upper() if mode else None
 
         # The SPC and LICW number should be found in the comment field,
         # formatted with optional bonus letters and optional 3rd
         # field list as: LICW[SPC:1234is:FIRST,F2F]
         extras_list = []
-        if 'COMMENT' in qso_fields:
-            match = re.search(r'LICW\[(.+)\]', qso_fields['COMMENT'].upper())
-            if match:
+        comment = get('COMMENT')
+        if comment:
+            comment = comment.upper()
+            # Find the text between 'LICW[' and the next ']'
+            start = comment.find('LICW[')
+            end = comment.find(']', start + 5) if start >= 0 else -1
+            if end > start + 5:
                 # Parse out the LICW data
-                licw = match[1].split(':')
+                licw = comment[start + 5:end].split(':')
                 if len(licw) > 1:
-                    self._spc = licw[0]
-                    # Parse the LICW number into number and bonus letters
-                    nr_match = re.match(r'(\d+)([a-zA-Z]*)', licw[1])
-                    if nr_match:
-                        self._licw_nr = nr_match[1]
-                        if nr_match.lastindex > 1:
-                            self._bonus_letters = nr_match[2]
+                    self.spc = sys.intern(licw[0])
+                    # Parse the LICW number into number and bonus letters,
+                    # i.e. the leading ASCII digits then ASCII letters.
+                    # lstrip() does the character scans in C.
+                    number = licw[1]
+                    after_digits = number.lstrip(string.digits)
+                    if len(after_digits) < len(number):
+                        self._licw_nr = number[:len(number) - len(after_digits)]
+                        after_letters = after_digits.lstrip(string.ascii_letters)
+                        self._bonus_letters = after_digits[:len(after_digits) - len(after_letters)]
                     # Optional 3rd field present?
                     if len(licw) == 3:
                         extras_list = licw[2].split(',')
@@ -239,35 +272,26 @@ class Qso():
         if self._licw_nr:
             # Calculate the base points - only one entry from POINTS
             # allowed, choose the one with the highest value
-            self._points = 1
-            if self._callsign in POINTS:
-                self._points = POINTS[self._callsign]
-            for letter in self._bonus_letters:
-                if letter in POINTS:
-                    if POINTS[letter] > self._points:
-                        self._points = POINTS[letter]
-            for extra in extras_list:
-                if extra in POINTS:
-                    if POINTS[extra] > self._points:
-                        self._points = POINTS[extra]
-            # Calculate optional bonus points
-            self._bonus = 0
-            for letter in self._bonus_letters:
-                if letter in BONUS:
-                    self._bonus += BONUS[letter]
-            for extra in extras_list:
-                if extra in BONUS:
-                    self._bonus += BONUS[extra]
+            self.points = POINTS.get(self._callsign, 1)
+            # Optional bonus points are added up as we go
+            self.bonus = 0
+            # The bonus letters and extras can score both, so score
+            # them together in one pass, looking each up once
+            for key in chain(self._bonus_letters, extras_list):
+                points, bonus = SCORE_TABLE.get(key, (0, 0))
+                if points > self.points:
+                    self.points = points
+                self.bonus += bonus
             # DX contact?
-            if len(self._spc) == 3 or self._spc in SPC_DX:
-                self._bonus += BONUS['DX']
+            if len(self.spc) == 3 or self.spc in SPC_DX:
+                self.bonus += BONUS['DX']
 
 # *******************************************************************
 #  ADIF parser
 # *******************************************************************
 
 class AdiDataSpecifierParser():
-    ''' Class to parse an ADI Data Specifier, character by character.
+    ''' Class to parse an ADI Data Specifier tag.
         Specifiers are of the form:
             <F:L:T>D
         Where:
@@ -275,26 +299,23 @@ class AdiDataSpecifierParser():
             L = data length (optional, zero if not present)
             T = data type inicator (optional, text if not present)
             D = data of length L
+
+        The caller locates the tag and its data in the input text,
+        this class decodes the tag contents and holds the result.
     '''
-    class State(Enum):
-        ''' Enum for parser state '''
-        WAIT_START = auto(),
-        WAIT_END = auto(),
-        DONE_TAG = auto(),
-        TEXT = auto(),
-        DONE_TEXT = auto()
+
+    __slots__ = ('_name', '_length', '_data')
 
     def __init__(self):
         ''' Constructor '''
-        self._buffer = ''
-        self._length = 0
         self._name = ''
-        self._state = self.State.WAIT_START
+        self._length = 0
+        self._data = ''
 
     @property
     def name(self):
         ''' Getter for field name, converted to uppercase  '''
-        return self._name.upper()
+        return self._name
 
     @property
     def length(self):
@@ -304,77 +325,49 @@ class AdiDataSpecifierParser():
     @property
     def data(self):
         ''' Getter for the optional data '''
-        return self._buffer
+        return self._data
 
-    def _reset_buffer_for_tag(self):
-        ''' Resets the buffer start building a <ADIF:n> style tag '''
-        self._buffer = ''
-        self._length = 0
-        self._state = self.State.WAIT_START
-
-    def _reset_buffer_for_string(self, required_length):
-        ''' Resets the buffer for reading a text string '''
-        self._buffer = ''
-        self._length = required_length
-        self._state = self.State.TEXT
-
-    def _update_buffer(self, char):
-        ''' Process the next character '''
-        if self._state == self.State.WAIT_START:
-            # Skipping characters, waiting for a '<'
-            if char == '<':
-                self._state = self.State.WAIT_END
-        elif self._state == self.State.WAIT_END:
-            # Appending to the buffer, waiting for a '>'
-            if char == '>':
-                self._state = self.State.DONE_TAG
-            else:
-                self._buffer += char
-        elif self._state == self.State.TEXT:
-            # Building a string of required length
-            self._buffer += char
-            if len(self._buffer) == self._length:
-                self._state = self.State.DONE_TEXT
+    @data.setter
+    def data(self, data):
+        ''' Setter for the data, once read by the caller '''
+        self._data = data
 
     def reset(self):
         ''' Reset the parser, ready to find another ADI data specifier '''
-        self._buffer = ''
-        self._length = 0
         self._name = ''
-        self._state = self.State.WAIT_START
-
-    def parse_char(self, char):
-        ''' Parse another character.
-            Returns True if a complete ADI data specifier is
-            now available, False otherwise. After the caller
-            has finsihed accessing the data, reset() must be called
-            to start parsing for a new data specifier.
+        self._length = 0
+        self._data = ''
+
+    def parse_tag(self, tag):
+        ''' Parse the contents of a tag, i.e. the text between
+            the '<' and '>' characters. After this the length
+            property gives the number of data characters that
+            follow the tag.
         '''
-        self._update_buffer(char)
-        if self._state == self.State.DONE_TAG:
-            # Split tag into fields
-            fields = self._buffer.split(':')
-            # Name always present
-            self._name = fields[0]
-            if len(fields) > 1:
-                try:
-                    data_length = int(fields[1])
-                    if data_length > 0:
-                        self._reset_buffer_for_string(data_length)
-                except ValueError:
-                    raise ChallengeException("invalid ADI length field: ", self._buffer) from None
-                # TODO add support for types? Not actually needed for this application
-            else:
-                # Name only, no data
-                self._length = 0
-        return self._state in (self.State.DONE_TAG, self.State.DONE_TEXT)
+        self.reset()
+        # Split off the name, partition() avoids building a list
+        # and tags such as <EOR> have no further fields
+        name, separator, length = tag.partition(':')
+        # Name always present, case independant so convert it to
+        # uppercase once here. The data is left exactly as found.
+        self._name = name.upper()
+        if separator:
+            # Drop the optional type field
+            # TODO add support for types? Not actually needed for this application
+            length = length.partition(':')[0]
+            # Lengths are nearly always valid, so check the digits
+            # up front rather than relying on int() raising
+            if not length.isdecimal():
+                raise ChallengeException("invalid ADI length field: ", tag)
+            self._length = int(length)
 
 class AdifParser():
     ''' Class to parse an ADIF file
 
         The ADIF spec (www.adif.org) doesn't seem to restrict a
         data specifier to be completely defined on one line,
-        so this implements a char-by-char stream parser.
+        so this implements a stream parser which keeps any
+        incomplete data specifier until more text arrives.
 
         A data specifier is of the form:
              <fieldname:length:optional type>data
@@ -382,13 +375,18 @@ class AdifParser():
         An optional header is present if the first character is not a '<'.
     '''
 
-    def __init__(self, qsos_deque):
-        ''' Constructor '''
+    __slots__ = ('_started', '_header_done', '_adi_parser', '_on_qso',
+                 '_current_qso', '_residual', '_all_qso_count')
+
+    def __init__(self, on_qso):
+        ''' Constructor, on_qso is called with each valid QSO found '''
         self._started = False
         self._header_done = False
         self._adi_parser = AdiDataSpecifierParser()
-        self._qsos = qsos_deque
+        self._on_qso = on_qso
         self._current_qso = {}
+        # Text not yet consumed, i.e. a partial data specifier
+        self._residual = ''
         # A count of all QSO records seen, regardless
         # of whether a challenge QSO or not. Helpful
         # for indicating where an error has occured.
@@ -408,48 +406,78 @@ class AdifParser():
             info += f"at {self._current_qso['TIME_ON']} "
         return info.strip()
 
+    def _process_specifier(self):
+        ''' Handle a complete ADI data specifier '''
+        # Parsing header?
+        if not self._header_done:
+            # Skip header contents until <EOH> is found
+            if self._adi_parser.name == 'EOH':
+                self._header_done = True
+        else:
+            # Each QSO record is complete on 'EOR'
+            if self._adi_parser.name == 'EOR':
+                # Create a QSO object and if valid pass it on. Records
+                # missing a required field or not CW can't be valid, so
+                # don't spend time loading and scoring them.
+                if (REQUIRED_FIELDS <= self._current_qso.keys()
+                        and self._current_qso['MODE'].upper() == 'CW'):
+                    qso = Qso(self._current_qso)
+                    if qso.is_valid:
+                        self._on_qso(qso)
+                self._current_qso.clear()
+                self._all_qso_count += 1
+            elif self._adi_parser.length > 0 and self._adi_parser.name in QSO_FIELDS:
+                # Intern the name, making it the same object as the
+                # literal keys the QSO is later looked up with
+                self._current_qso[sys.intern(self._adi_parser.name)] = self._adi_parser.data
+
     def reset_parser(self):
         ''' Reset the parser '''
         self._started = False
         self._header_done = False
+        self._residual = ''
         self._all_qso_count = 1
 
     def parse(self, string):
-        ''' Incremental string parser - normally this function
-            would be called for each line read from the ADIF file
+        ''' Incremental string parser - may be called with the
+            whole of an ADIF file or with successive parts of it
         '''
-        for char in string:
-            # Is this the first call to parse a file?
-            if not self._started:
-                # Determine if a header is present by examing the first
-                # character. ADIF spec says header present if not a '<'.
-                if char == '<':
-                    self._header_done = True
-                self._started = True
-            # Pass the character into the ADI data specifier parser
-            try:
-                if self._adi_parser.parse_char(char):
-                    # Parsing header?
-                    if not self._header_done:
-                        # Skip header contents until <EOH> is found
-                        if self._adi_parser.name == 'EOH':
-                            self._header_done = True
-                    else:
-                        # Each QSO record is complete on 'EOR'
-                        if self._adi_parser.name == 'EOR':
-                            # Create a QSO object and if valid place on queue
-                            qso = Qso(self._current_qso)
-                            if qso.is_valid:
-                                self._qsos.append(qso)
-                            self._current_qso.clear()
-                            self._all_qso_count += 1
-                        elif self._adi_parser.length > 0:
-                            self._current_qso[self._adi_parser.name] = self._adi_parser.data
-                    # ADI specifier complete, start on next one
-                    self._adi_parser.reset()
-            except ChallengeException as err:
-                err.add_context(f"In QSO record #{self._all_qso_count} with {self._get_key_qso_parts()}")
-                raise
+        # Is this the first call to parse a file?
+        if not self._started and string:
+            # Determine if a header is present by examing the first
+            # character. ADIF spec says header present if not a '<'.
+            if string[0] == '<':
+                self._header_done = True
+            self._started = True
+        text = self._residual + string
+        pos = 0
+        try:
+            while True:
+                # Skip any text up to the start of the next tag
+                start = text.find('<', pos)
+                if start < 0:
+                    pos = len(text)
+                    break
+                end = text.find('>', start + 1)
+                if end < 0:
+                    # Incomplete tag, wait for more text
+                    pos = start
+                    break
+                self._adi_parser.parse_tag(text[start + 1:end])
+                data_end = end + 1 + self._adi_parser.length
+                if data_end > len(text):
+                    # Incomplete data, wait for more text
+                    pos = start
+                    break
+                self._adi_parser.data = text[end + 1:data_end]
+                self._process_specifier()
+                # ADI specifier complete, start on next one
+                pos = data_end
+        except ChallengeException as err:
+            err.add_context(f"In QSO record #{self._all_qso_count} with {self._get_key_qso_parts()}")
+            raise
+        finally:
+            self._residual = text[pos:]
 
 # *******************************************************************
 #  Challenge scorer
@@ -458,6 +486,9 @@ class AdifParser():
 class LicwChallenge():
     ''' Class representing a LICW challenge '''
 
+    __slots__ = ('_qso_list', '_start_date', '_end_date', '_qso_points',
+                 '_spc_counts', '_num_qsos', '_total_score', '_num_spc')
+
     def __init__(self, start_date, end_date):
         ''' Constructor '''
         # Dictionary of valid QSO objects
@@ -466,6 +497,11 @@ class LicwChallenge():
         # Either may be None to disable that check.
         self._start_date = start_date
         self._end_date = end_date
+        # Running totals, updated as each QSO is added so that scoring
+        # doesn't need another pass over the QSOs. The number of QSOs
+        # per SPC is kept so a replaced duplicate can give up its SPC.
+        self._qso_points = 0
+        self._spc_counts = Counter()
         # Calculated scores
         self._num_qsos = 0
         self._total_score = 0
@@ -491,45 +527,64 @@ class LicwChallenge():
         ''' Getter for a list of validated QSOs '''
         return self._qso_list.values()
 
+    def _remove_qso(self, qso):
+        ''' Remove a QSO from the running totals '''
+        self._qso_points -= qso.total
+        self._spc_counts[qso.spc] -= 1
+        if not self._spc_counts[qso.spc]:
+            del self._spc_counts[qso.spc]
+
+    def _include_qso(self, qso):
+        ''' Include a QSO in the running totals '''
+        self._qso_points += qso.total
+        self._spc_counts[qso.spc] += 1
+
+    def add_qso(self, qso):
+        ''' Add a QSO to the challenge
+        '''
+        # Optional date filters
+        if self._start_date:
+            if qso.date < self._start_date:
+                return
+        if self._end_date:
+            if qso.date > self._end_date:
+                return
+        # The callsign+band tuple must be unique
+        callsign_band = (qso.callsign, qso.band)
+        # Already worked this station on this band?
+        worked = self._qso_list.get(callsign_band)
+        if worked is not None:
+            # Choose the QSO with the highest score
+            if qso.total > worked.total:
+                self._remove_qso(worked)
+                self._include_qso(qso)
+                self._qso_list[callsign_band] = qso
+        else:
+            self._include_qso(qso)
+            self._qso_list[callsign_band] = qso
+
     def add_qsos(self, qsos):
         ''' Add one or more QSOs to the challenge
         '''
         for qso in qsos:
-            # Optional date filters
-            if self._start_date:
-                if qso.date < self._start_date:
-                    continue
-            if self._end_date:
-                if qso.date > self._end_date:
-                    continue
-            # The callsign+band tuple must be unique
-            callsign_band = (qso.callsign, qso.band)
-            # Already worked this station on this band?
-            if callsign_band in self._qso_list:
-                # Choose the QSO with the highest score
-                if qso.total > self._qso_list[callsign_band].total:
-                    self._qso_list[callsign_band] = qso
-            else:
-                self._qso_list[callsign_band] = qso
+            self.add_qso(qso)
 
     def calculate_score(self):
         ''' Calculate the challenge score '''
-        self._total_score = 0
-        spc = {}
-        for qso in self._qso_list.values():
-            self._total_score += qso.total
-            spc[qso.spc] = True
-        self._num_spc = len(spc)
+        self._num_spc = len(self._spc_counts)
         self._num_qsos = len(self._qso_list)
         # Plus one point per SPC
-        self._total_score += self._num_spc
+        self._total_score = self._qso_points + self._num_spc
 
 # *******************************************************************
 #  Functions
 # *******************************************************************
 
+@lru_cache(maxsize=None)
 def date_formatter(numeric_date):
-    ''' Convert date from integer YYYYMMDD to a user readable string '''
+    ''' Convert date from integer YYYYMMDD to a user readable string.
+        Results are cached as many QSOs share the same date.
+    '''
     day = f"{numeric_date}"
     # Convert string to ISO YYYY-MM-DD format for date function.
     day = f"{day[:4]}-{day[4:6]}-{day[6:8]}"
@@ -544,8 +599,9 @@ def determine_date_range(quarter):
     '''
     start = None
     end = None
-    start_mmdd = [101, 401, 701, 1001]
-    end_mmdd = [331, 630, 930, 1231]
+    # Constant tuples, built once when the function is compiled
+    start_mmdd = (101, 401, 701, 1001)
+    end_mmdd = (331, 630, 930, 1231)
     # An undefined quarter will remove any date restriction
     if quarter:
         if quarter == 'now':
@@ -553,49 +609,53 @@ def determine_date_range(quarter):
             qnum = int((datetime.now().month - 1) / 3)
             year = datetime.now().year
         else:
-            try:
-                qnum, year = quarter.split(':')
-                qnum = int(qnum)
-                if qnum < 1 or qnum > 4:
-                    raise ChallengeException(f"invalid quarter {qnum}:", quarter)
-                # qnum numbers from zero
-                qnum -= 1
-                year = int(year)
-                if year < 100:
-                    year += 2000
-            except ValueError as err:
-                raise ChallengeException(f"invalid quarter {quarter}:", err) from None
+            match = _QUARTER_RE.fullmatch(quarter)
+            if not match:
+                raise ChallengeException(f"invalid quarter {quarter}:",
+                                         "expected now or [1..4]:[year]")
+            # qnum numbers from zero
+            qnum = int(match[1]) - 1
+            year = int(match[2])
+            if year < 100:
+                year += 2000
         # Calculate start and end dates for the quarter, YYYYMMDD
         start = (year * 10000) + start_mmdd[qnum]
         end = (year * 10000) + end_mmdd[qnum]
     return start, end
 
+def read_logfile(filename):
+    ''' Read the whole of the given log file into a string.
+        A regular file is memory mapped and decoded straight from the
+        mapping, avoiding an intermediate copy of the file contents.
+        Anything else, such as a pipe, is read normally.
+    '''
+    with open(filename, 'rb') as logfile:
+        # Only a non-empty file can be mapped, pipes and the like
+        # also report a size of zero so must be read instead
+        if os.fstat(logfile.fileno()).st_size == 0:
+            return logfile.read().decode('latin-1')
+        with mmap.mmap(logfile.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return str(mapped, 'latin-1')
+
 def parse_logfile(filenames, quarter):
     ''' Parse the given ADIF log file(s) '''
-    qsos = deque()
-    adif = AdifParser(qsos)
-
-    # Parsing strategy: read file one line at a time, stripping
-    # trailing newlines and then pass those to my stream parser.
-    # N.B: ADI files are explicitly not allowed unicode characters
-    #      so OK to open as latin-1 for Windows compatibility.
-    for filename in filenames:
-        with open(filename, 'r', encoding='latin-1') as logfile:
-            while True:
-                line = logfile.readline()
-                if not line:
-                    break
-                # Strip any trailing newline and pass to parser
-                adif.parse(line.rstrip('\n'))
-
     # Determine optional date filters
     start_date, end_date = determine_date_range(quarter)
 
     challenge = LicwChallenge(start_date, end_date)
 
-    # Pass the queue of valid LICW challenge QSOs to the challenge
-    # which will apply the cross QSO rules including handling duplicates
-    challenge.add_qsos(qsos)
+    # The parser passes each valid LICW challenge QSO straight to the
+    # challenge, which will apply the cross QSO rules including
+    # handling duplicates
+    adif = AdifParser(challenge.add_qso)
+
+    # Parsing strategy: read the whole file and pass it to my stream
+    # parser in one go; data specifiers are not line based and the
+    # parser skips any text (including newlines) between them.
+    # N.B: ADI files are explicitly not allowed unicode characters
+    #      so OK to open as latin-1 for Windows compatibility.
+    for filename in filenames:
+        adif.parse(read_logfile(filename))
 
     # And calculate the total score
     challenge.calculate_score()
@@ -604,6 +664,7 @@ def parse_logfile(filenames, quarter):
     if quarter:
         print(f"\nFor the quarter from {date_formatter(start_date)} to {date_formatter(end_date)}:")
     print("\n--------------------------------------------------------------------")
+    lines = []
     for qso in challenge.validated_qsos:
         number = qso.licw_nr
         if qso.bonus_letters:
@@ -614,8 +675,10 @@ def parse_logfile(filenames, quarter):
             points = f"{qso.points} point"
             if qso.total > 1:
                 points += 's'
-        print(f"{date_formatter(qso.date)}   {qso.callsign:10} {qso.name:10}"
-              f"{qso.spc:>3} {number:>8} {qso.band:>5}  {points}")
+        lines.append(f"{date_formatter(qso.date)}   {qso.callsign:10} {qso.name:10}"
+                     f"{qso.spc:>3} {number:>8} {qso.band:>5}  {points}\n")
+    # Write the listing in one go rather than a print per QSO
+    sys.stdout.write(''.join(lines))
     print("--------------------------------------------------------------------")
     print(f"\nTotal of {challenge.num_qsos} QSOs with {challenge.num_spc} unique SPCs")
     print(f"Total score = {challenge.total_score}\n")
@@ -625,27 +688,32 @@ def parse_logfile(filenames, quarter):
 #  Main
 # *******************************************************************
 
-ARG_PARSER = argparse.ArgumentParser(description=textwrap.dedent('''\
-    Script to parse an ADIF file and calculate a LICW challenge score.
+def main():
+    ''' Parse the command line arguments and score the given log file(s) '''
+    arg_parser = argparse.ArgumentParser(description=textwrap.dedent('''\
+        Script to parse an ADIF file and calculate a LICW challenge score.
+
+        See https://github.com/JonathanPerkins/licw-challenge for full
+        instructions.
+        '''),
+        formatter_class=argparse.RawTextHelpFormatter)
 
-    See https://github.com/JonathanPerkins/licw-challenge for full
-    instructions.
-    '''),
-    formatter_class=argparse.RawTextHelpFormatter)
+    # At least one input file required
+    arg_parser.add_argument('log_files', metavar='<ADIF log file>', nargs='+')
 
-# At least one input file required
-ARG_PARSER.add_argument('log_files', metavar='<ADIF log file>', nargs='+')
+    # Optional arguments
+    arg_parser.add_argument('-q', '--quarter',
+                            dest='quarter', default=None,
+                            metavar='<now|[1..4]:[year]>',
+                            help="specify which year quarter to extract QSOs from (default no date limit)")
 
-# Optional arguments
-ARG_PARSER.add_argument('-q', '--quarter',
-                        dest='quarter', default=None,
-                        metavar='<now|[1..4]:[year]>',
-                        help="specify which year quarter to extract QSOs from (default no date limit)")
+    args = arg_parser.parse_args()
 
-ARGS = ARG_PARSER.parse_args()
+    try:
+        # Process log file
+        parse_logfile(args.log_files, args.quarter)
+    except ChallengeException as ex:
+        print(f"Error: {ex.context}: {ex} {ex.additional}")
 
-try:
-    # Process log file
-    parse_logfile(ARGS.log_files, ARGS.quarter)
-except ChallengeException as ex:
-    print(f"Error: {ex.context}: {ex} {ex.additional}")
+if __name__ == '__main__':
+    main()